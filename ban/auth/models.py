@@ -1,6 +1,9 @@
+import time
 import uuid
 from datetime import timedelta
 
+import peewee
+
 from ban import db
 from ban.core.resource import ResourceModel
 
@@ -73,6 +76,9 @@ class Client(ResourceModel):
     contributor_types = db.ArrayField(db.CharField, default=[TYPE_VIEWER], null=True)
     scopes = db.ArrayField(db.CharField, default=[], null=True)
 
+    # Seconds a client found by from_client_id is reused.
+    CACHE_TTL = 60
+
     @property
     def default_redirect_uri(self):
         return self.redirect_uris[0] if self.redirect_uris else None
@@ -86,6 +92,22 @@ class Client(ResourceModel):
     def default_scopes(self):
         return self.scopes
 
+    @classmethod
+    def from_client_id(cls, client_id):
+        """Client matching `client_id`, if any.
+
+        Cached, as OAuth asks for it several times while authenticating, for
+        CACHE_TTL seconds at most: a client changed by another process does
+        not clear this process cache. Unknown ids are not cached."""
+        key = ('Client', 'client_id', client_id)
+        cached = db.cache.get(key)
+        if cached is not db.cache.UNSET and cached[0] > time.monotonic():
+            return cached[1]
+        client = cls.first(cls.client_id == client_id)
+        if client is not None:
+            db.cache.set(key, (time.monotonic() + cls.CACHE_TTL, client))
+        return client
+
     def save(self, *args, **kwargs):
         if not self.client_secret:
             self.client_secret = generate_secret()
@@ -135,14 +157,24 @@ class Session(db.Model):
     email = db.CharField(null=True)  # TODO EmailField
     contributor_type = db.CharField(null=True)
 
+    @classmethod
+    def select_related(cls):
+        """Select sessions with their user and client, if any."""
+        return (cls.select(cls, User, Client)
+                   .join(User, peewee.JOIN.LEFT_OUTER)
+                   .switch(cls)
+                   .join(Client, peewee.JOIN.LEFT_OUTER))
+
     def serialize(self, *args):
         # Pretend to be a resource for created_by/modified_by values in
         # resources serialization.
         # Should we also expose the email/ip? CNIL question to be solved.
+        client = self.client
+        user = self.user
         return {
             'id': self.pk,
-            'client': self.client.name if self.client else None,
-            'user': self.user.username if self.user else None,
+            'client': client.name if client else None,
+            'user': user.username if user else None,
             'contributor_type': self.contributor_type if self.contributor_type else None
         }
 
@@ -204,7 +236,7 @@ class Token(db.Model):
             return None, None
         if not data.get('client_id'):
             return None, 'Client id missing'
-        client = Client.first(Client.client_id == data['client_id'])
+        client = Client.from_client_id(data['client_id'])
         if len(client.contributor_types) == 0:
             return None, 'Client has none contributor types'
         contributor_type = client.contributor_types[0]
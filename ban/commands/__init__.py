@@ -1,19 +1,73 @@
 import argparse
 import inspect
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from itertools import zip_longest
 
 from ban.core import config, context
+from ban.db import database
 
 from .reporter import Reporter
 
 
 NO_DEFAULT = object()
 NARGS = ...
+# Docstring lines documenting a parameter, eg. `path    path of the file`.
+PARAMETER_HELP = re.compile(r'^[ \t]*(\w+)[ \t]+(.+)$', re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def get_spec(func):
+    """Return func parameters as (name, default) pairs."""
+    spec = []
+    for param in inspect.signature(func).parameters.values():
+        if param.kind == param.VAR_POSITIONAL:
+            spec.append((param.name, NARGS))
+        elif param.default is not param.empty:
+            spec.append((param.name, param.default))
+        elif param.kind == param.POSITIONAL_OR_KEYWORD:
+            spec.append((param.name, NO_DEFAULT))
+    return tuple(spec)
+
+
+class LazyParsers(dict):
+    """Map command names to their parser, building it on first lookup."""
+
+    def __getitem__(self, name):
+        value = super().__getitem__(name)
+        if isinstance(value, Command):
+            value = value.parser
+        return value
+
+
+class CommandsAction(argparse._SubParsersAction):
+    """Subparsers action that only builds the parser of the invoked command.
+
+    Commands are registered with their name and short help only, so running
+    one command (or `--help`) does not pay the inspection and argparse setup
+    of all the others."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._name_parser_map = self.choices = LazyParsers()
+
+    def add_command(self, command):
+        self._choices_actions.append(
+            self._ChoicesPseudoAction(command.name, (), command.short_help))
+        self._name_parser_map[command.name] = command
+
+    def build_parser(self, name, **kwargs):
+        kwargs.setdefault('prog', '{} {}'.format(self._prog_prefix, name))
+        parser = self._parser_class(**kwargs)
+        # Replace the command by its parser, so next lookups are direct.
+        self._name_parser_map[name] = parser
+        return parser
+
 
 parser = argparse.ArgumentParser()
-subparsers = parser.add_subparsers(title='Available commands', metavar='')
+subparsers = parser.add_subparsers(title='Available commands', metavar='',
+                                   action=CommandsAction)
 
 
 class Command:
@@ -32,15 +86,24 @@ class Command:
 
     def __init__(self, command):
         self.command = command
-        self.inspect()
-        self.init_parser()
-        self.set_globals()
-        self._reports = {}
+        module = inspect.getmodule(command)
+        self.namespace = getattr(module, '__namespace__',
+                                 inspect.getmodulename(module.__file__))
+        self.name = self.namespace + ':' + command.__name__
+        self.help = command.__doc__ or ''
+        self.short_help = self.help.split('\n\n')[0]
+        self._spec = None
+        self._parser = None
+        self._parameters_help = None
+        subparsers.add_command(self)
 
     def __call__(self, *args, **kwargs):
         """Run command."""
         reporter = Reporter(config.get('VERBOSE'))
         context.set('reporter', reporter)
+        # Only release the connection if the command is the one which took
+        # it from the pool (we may be called from an API request).
+        release = database.is_closed()
         try:
             self.command(*args, **kwargs)
         except KeyboardInterrupt:
@@ -56,6 +119,8 @@ class Command:
                 except (OSError, IOError) as e:
                     print('Unable to write report to', filepath)
                     print(e)
+            if release and not database.is_closed():
+                database.close()
 
     def invoke(self, parsed):
         """Run command from command line args."""
@@ -85,48 +150,35 @@ class Command:
                 config.set(name, value)
 
     @property
-    def namespace(self):
-        module = inspect.getmodule(self.command)
-        return getattr(module, '__namespace__',
-                       inspect.getmodulename(module.__file__))
-
-    @property
-    def name(self):
-        return self.namespace + ':' + self.command.__name__
+    def spec(self):
+        if self._spec is None:
+            self.inspect()
+        return self._spec
 
     @property
-    def help(self):
-        return self.command.__doc__ or ''
-
-    @property
-    def short_help(self):
-        return self.help.split('\n\n')[0]
+    def parser(self):
+        if self._parser is None:
+            self.init_parser()
+        return self._parser
 
     def inspect(self):
         self.__doc__ = inspect.getdoc(self.command)
-        spec = inspect.getfullargspec(self.command)
-        arg_names = spec.args[:]
-        matched_args = [reversed(x) for x in [spec.args, spec.defaults or []]]
-        spec_dict = dict(zip_longest(*matched_args, fillvalue=NO_DEFAULT))
-        self.spec = [(x, spec_dict[x]) for x in arg_names]
-        if spec.kwonlydefaults:
-            for key, value in spec.kwonlydefaults.items():
-                self.spec.append((key, value))
-        if spec.varargs:
-            self.spec.append((spec.varargs, NARGS))
+        self._spec = get_spec(self.command)
 
     def parse_parameter_help(self, name):
-        try:
-            return self.help.split(name, 1)[1].split('\n')[0].strip()
-        except IndexError:
-            return ''
+        if self._parameters_help is None:
+            self._parameters_help = {}
+            for param, text in PARAMETER_HELP.findall(self.help):
+                self._parameters_help.setdefault(param, text.strip())
+        return self._parameters_help.get(name, '')
 
     def init_parser(self):
-        self.parser = subparsers.add_parser(self.name, help=self.short_help,
-                                            conflict_handler='resolve')
-        self.parser.set_defaults(func=self.invoke)
+        self._parser = subparsers.build_parser(self.name,
+                                               conflict_handler='resolve')
+        self._parser.set_defaults(func=self.invoke)
         for name, default in self.spec:
             self.add_argument(name, default)
+        self.set_globals()
 
     def add_argument(self, name, default=NO_DEFAULT, **kwargs):
             kwargs['help'] = self.parse_parameter_help(name)
@@ -134,8 +186,8 @@ class Command:
             if default not in (NO_DEFAULT, NARGS):
                 kwargs['dest'] = name
                 if '_' not in name:
-                    args.append('-{}'.format(name[0]))
-                args[0] = '--{}'.format(name.replace('_', '-'))
+                    args.append('-' + name[0])
+                args[0] = '--' + name.replace('_', '-')
                 kwargs['default'] = default
                 type_ = type(default)
                 if type_ == bool:
@@ -1,3 +1,5 @@
+import sys
+
 from ban.auth.models import Token, User, Client, Session
 from ban.commands import command, reporter
 from ban.core import context
@@ -11,12 +13,13 @@ from . import helpers
 def dummytoken(token, **kwargs):
     """Create a dummy token for dev."""
     session = context.get('session')
-    Token.delete().where(Token.access_token == token).execute()
-    Token.create(session=session.pk, access_token=token, expires_in=3600*24,
-                 token_type='Bearer',
-                 scopes="municipality_write postcode_write \
-                 group_write housenumber_write position_write bal".split(),
-                 status='dev')
+    with Token._meta.database.atomic():
+        Token.delete().where(Token.access_token == token).execute()
+        Token.create(session=session.pk, access_token=token,
+                     expires_in=3600*24, token_type='Bearer',
+                     scopes="municipality_write postcode_write \
+                     group_write housenumber_write position_write bal".split(),
+                     status='dev')
     reporter.notice('Created token', token)
 
 
@@ -46,12 +49,12 @@ def invalidatetoken(client=None, user=None, **kwargs):
             return reporter.error('Client not found', user)
         where_clause = (Session.client_id == client_inst.pk)
 
-    tokens = Token.select().join(Session).where(
-        where_clause).where(Token.expires > utcnow())
-    for token in tokens:
-        token.expires = utcnow()
-        token.save()
-    reporter.notice('Invalidate {} tokens'.format(len(tokens)), tokens)
+    now = utcnow()
+    sessions = Session.select(Session.pk).where(where_clause)
+    count = (Token.update(expires=now)
+                  .where(Token.session << sessions, Token.expires > now)
+                  .execute())
+    reporter.notice('Invalidate {} tokens'.format(count), count)
 
 
 @command
@@ -66,10 +69,10 @@ def createuser(username=None, email=None, is_staff=False, **kwargs):
         email = helpers.prompt('Email')
     validator = User.validator(username=username, email=email)
     if not validator.errors:
-        user = validator.save()
         if is_staff:
-            user.is_staff = True
-            user.save()
+            # Not a resource field, so not validated: set it for the insert.
+            validator.data['is_staff'] = True
+        user = validator.save()
         reporter.notice('Created', user)
     else:
         reporter.error('Errored', validator.errors)
@@ -78,10 +81,13 @@ def createuser(username=None, email=None, is_staff=False, **kwargs):
 @command
 def listusers(**kwargs):
     """List registered users with details."""
-    tpl = '{:<20} {}'
-    print(tpl.format('id', 'username', 'email'))
-    for user in User.select():
-        print(tpl.format(user.id, user.username, user.email))
+    line = '{:<20} {} {}\n'.format
+    users = User.select(User.id, User.username, User.email)
+    sys.stdout.write(line('id', 'username', 'email'))
+    # One buffered write stream instead of a print call per row.
+    sys.stdout.writelines(line(user.id, user.username, user.email)
+                          for user in users)
+    sys.stdout.flush()
 
 
 @command
@@ -120,9 +126,14 @@ def createclient(name=None, user=None, scopes=[], contributor_types=[], **kwargs
 @command
 def listclients(**kwargs):
     """List existing clients with details."""
-    tpl = '{:<50} {:<40} {:<40} {:<60} {:<200} {}'
-    print(tpl.format('id', 'name', 'client_id', 'client_secret', 'scopes', 'contributor_types'))
-    for client in Client.select():
-        print(tpl.format(client.id, client.name, str(client.client_id),
-                         client.client_secret, ' '.join(client.scopes or []),
-                         ' '.join(client.contributor_types or [])))
+    line = '{:<50} {:<40} {:<40} {:<60} {:<200} {}\n'.format
+    clients = Client.select(Client.id, Client.name, Client.client_id,
+                            Client.client_secret, Client.scopes,
+                            Client.contributor_types)
+    sys.stdout.write(line('id', 'name', 'client_id', 'client_secret', 'scopes', 'contributor_types'))
+    sys.stdout.writelines(
+        line(client.id, client.name, str(client.client_id),
+             client.client_secret, ' '.join(client.scopes or []),
+             ' '.join(client.contributor_types or []))
+        for client in clients)
+    sys.stdout.flush()
@@ -15,7 +15,7 @@ QUERIES = {
     'PostCode': PostCode.select(),
     'Municipality': Municipality.select(),
     'Group': Group.select(),
-    'HouseNumber': HouseNumber.select(),
+    'HouseNumber': HouseNumber.select_related(),
     'Position': Position.select()
 }
 
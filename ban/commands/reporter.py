@@ -9,6 +9,8 @@ Reporter must be:
 - able to output only on demand (when command is finished, not on the fly)
 - able to group reports by level and message
 """
+from collections import Counter
+
 from ban.core import context
 
 
@@ -54,7 +56,7 @@ class Reporter:
             if reports:
                 out[self.LEVEL_LABEL[level]] = []
                 for msg, data in reports.items():
-                    total = len(data) if self.verbosity else data
+                    total = len(data) if self.verbosity >= level else data
                     current = {
                         'total': total,
                         'msg': msg
@@ -66,28 +68,24 @@ class Reporter:
 
     def __call__(self, msg, data, level):
         if self.verbosity >= level:
-            self._reports[level].setdefault(msg, [])
-            self._reports[level][msg].append(data)
+            self._reports[level].setdefault(msg, []).append(data)
         else:
             # Do not consume memory and only track counts.
-            self._reports[level].setdefault(msg, 0)
             self._reports[level][msg] += 1
 
     def merge(self, reports):
         for level, msgs in reports.items():
             for msg, data in msgs.items():
                 if self.verbosity >= level:
-                    self._reports[level].setdefault(msg, [])
-                    self._reports[level][msg].extend(data)
+                    self._reports[level].setdefault(msg, []).extend(data)
                 else:
-                    self._reports[level].setdefault(msg, 0)
                     self._reports[level][msg] += data
 
     def clear(self):
+        # Levels we do not display the items of only need counts.
         self._reports = {
-            ERROR: {},
-            WARNING: {},
-            NOTICE: {}
+            level: {} if self.verbosity >= level else Counter()
+            for level in (ERROR, WARNING, NOTICE)
         }
 
     @property
@@ -46,7 +46,7 @@ class NamedModel(Model):
 
 
 class Municipality(NamedModel):
-    INSEE_FORMAT = '(2[AB]|\d{2})\d{3}'
+    INSEE_FORMAT = re.compile(r'(2[AB]|\d{2})\d{3}')
     identifiers = ['siren', 'insee']
     resource_fields = ['name', 'alias', 'insee', 'siren']
     exclude_for_version = ['postcodes']
@@ -121,7 +121,8 @@ class Group(NamedModel):
 class HouseNumber(Model):
     # INSEE + set of OCR-friendly characters (dropped confusing ones
     # (like 0/O, 1/I…)) from La Poste.
-    CEA_FORMAT = Municipality.INSEE_FORMAT + '[234679ABCEGHILMNPRSTUVXYZ]{5}'
+    CEA_FORMAT = re.compile(Municipality.INSEE_FORMAT.pattern +
+                            '[234679ABCEGHILMNPRSTUVXYZ]{5}')
     identifiers = ['cia', 'laposte', 'ign']
     resource_fields = ['number', 'ordinal', 'parent', 'cia', 'laposte',
                        'ancestors', 'positions', 'ign', 'postcode']
@@ -158,13 +159,19 @@ class HouseNumber(Model):
 
     @cached_property
     def municipality(self):
-        return Municipality.select().where(
-           Municipality.pk == self.parent.municipality.pk).first()
+        return self.parent.municipality
+
+    @classmethod
+    def select_related(cls):
+        """Select housenumbers with their parent and its municipality."""
+        return (cls.select(cls, Group, Municipality)
+                   .join(Group)
+                   .join(Municipality))
 
     @property
     def as_export(self):
         """Resources plus relation references without metadata."""
-        mask = {f: {} for f in self.resource_fields}
+        mask = dict.fromkeys(self.resource_fields, {})
         return self.serialize(mask)
 
 
@@ -241,7 +248,7 @@ class Position(Model):
 
     @cached_property
     def municipality(self):
-        return Municipality.select().where(Municipality.pk == self.housenumber.parent.municipality.pk).first()
+        return self.housenumber.parent.municipality
 
     def save(self, *args, **kwargs):
         super().save(*args, **kwargs)
@@ -5,7 +5,7 @@ import peewee
 from postgis import Point
 
 from ban import db
-from ban.utils import utcnow
+from ban.utils import parse_identifier, utcnow
 
 
 
@@ -14,17 +14,35 @@ from .exceptions import (IsDeletedError, MultipleRedirectsError, RedirectError,
 from .validators import ResourceValidator
 
 
-class BaseResource(peewee.BaseModel):
+def serialize_value(value, mask):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Point):
+        return value.geojson
+    return value
+
+
+def serialize_datetime(value, mask):
+    return value.isoformat()
+
+
+def serialize_point(value, mask):
+    return value.geojson
+
+
+def serialize_scalar(value, mask):
+    return value
+
 
-    def include_field_for_collection(cls, name):
-        if name in cls.exclude_for_collection:
-            return False
-        attr = getattr(cls, name, None)
-        exclude = (peewee.ReverseRelationDescriptor,
-                   peewee.SelectQuery)
-        if not attr or isinstance(attr, exclude):
-            return False
-        return True
+def serialize_relation(value, mask):
+    return value.serialize(mask)
+
+
+def serialize_relations(value, mask):
+    return [v.serialize(mask) for v in value]
+
+
+class BaseResource(peewee.BaseModel):
 
     def __new__(mcs, name, bases, attrs, **kwargs):
         # Inherit and extend instead of replacing.
@@ -32,10 +50,11 @@ class BaseResource(peewee.BaseModel):
         exclude_for_collection = attrs.pop('exclude_for_collection', None)
         exclude_for_version = attrs.pop('exclude_for_version', None)
         cls = super().__new__(mcs, name, bases, attrs, **kwargs)
+        cls.resource = name.lower()
         if resource_fields is not None:
             inherited = getattr(cls, 'resource_fields', {})
             resource_fields.extend(inherited)
-            cls.resource_fields = resource_fields
+            cls.resource_fields = tuple(resource_fields)
         if exclude_for_collection is not None:
             inherited = getattr(cls, 'exclude_for_collection', [])
             exclude_for_collection.extend(inherited)
@@ -44,12 +63,20 @@ class BaseResource(peewee.BaseModel):
             inherited = getattr(cls, 'exclude_for_version', [])
             exclude_for_version.extend(inherited)
             cls.exclude_for_version = exclude_for_version
-        cls.collection_fields = [
-            n for n in cls.resource_fields
-            if mcs.include_field_for_collection(cls, n)] + ['resource']
-        cls.versioned_fields = [
+        excluded = set(cls.exclude_for_collection)
+        collection_fields = []
+        for field_name in cls.resource_fields:
+            if field_name in excluded:
+                continue
+            attr = getattr(cls, field_name, None)
+            if isinstance(attr, (peewee.ReverseRelationDescriptor,
+                                 peewee.SelectQuery)) or not attr:
+                continue
+            collection_fields.append(field_name)
+        cls.collection_fields = tuple(collection_fields) + ('resource', )
+        cls.versioned_fields = tuple(
             n for n in cls.resource_fields
-            if n not in cls.exclude_for_version]
+            if n not in cls.exclude_for_version)
         return cls
 
 
@@ -68,7 +95,7 @@ class ResourceModel(db.Model, metaclass=BaseResource):
 
     @classmethod
     def make_id(cls):
-        return 'ban-{}-{}'.format(cls.__name__.lower(), uuid.uuid4().hex)
+        return 'ban-' + cls.__name__.lower() + '-' + uuid.uuid4().hex
 
     def save(self, *args, **kwargs):
         if not self.id:
@@ -81,14 +108,43 @@ class ResourceModel(db.Model, metaclass=BaseResource):
         validator.validate(data, instance=instance)
         return validator
 
-    @property
-    def resource(self):
-        return self.__class__.__name__.lower()
-
     @property
     def serialized(self):
         return self.id
 
+    @classmethod
+    def get_serializer(cls, name):
+        # Resolve once per class and field name: this runs for every field of
+        # every row of a collection. Reverse relations are only added to the
+        # class when the related model is declared, so we can't compute this
+        # at class creation time.
+        serializers = cls.__dict__.get('_serializers')
+        if serializers is None:
+            serializers = cls._serializers = {}
+        try:
+            return serializers[name]
+        except KeyError:
+            field = getattr(cls, name, None)
+            if not field:
+                raise ValueError('Unknown field {}'.format(name))
+            if isinstance(field, (db.ManyToManyField,
+                                  peewee.ReverseRelationDescriptor)):
+                serializer = serialize_relations
+            elif isinstance(field, db.ForeignKeyField):
+                serializer = serialize_relation
+            elif isinstance(field, db.DateTimeField):
+                serializer = serialize_datetime
+            elif isinstance(field, db.PointField):
+                serializer = serialize_point
+            elif isinstance(field, peewee.Field):
+                # Column values are already of their final type.
+                serializer = serialize_scalar
+            else:
+                # Properties: inspect the value itself.
+                serializer = serialize_value
+            serializers[name] = serializer
+            return serializer
+
     def serialize(self, mask=None):
         if not mask:
             return self.serialized
@@ -97,20 +153,10 @@ class ResourceModel(db.Model, metaclass=BaseResource):
             if name == '*':
                 return self.serialize({k: subfields
                                        for k in self.resource_fields})
-            field = getattr(self.__class__, name, None)
-            if not field:
-                raise ValueError('Unknown field {}'.format(name))
+            serializer = self.get_serializer(name)
             value = getattr(self, name)
             if value is not None:
-                if isinstance(field, (db.ManyToManyField,
-                                      peewee.ReverseRelationDescriptor)):
-                    value = [v.serialize(subfields) for v in value]
-                elif isinstance(field, db.ForeignKeyField):
-                    value = value.serialize(subfields)
-                elif isinstance(value, datetime):
-                    value = value.isoformat()
-                elif isinstance(value, Point):
-                    value = value.geojson
+                value = serializer(value, subfields)
             dest[name] = value
         return dest
 
@@ -123,7 +169,7 @@ class ResourceModel(db.Model, metaclass=BaseResource):
     @property
     def as_version(self):
         """Resources plus relations references and metadata."""
-        return self.serialize({f: {} for f in self.versioned_fields})
+        return self.serialize(dict.fromkeys(self.versioned_fields, {}))
 
     @property
     def as_export(self):
@@ -159,6 +205,25 @@ class ResourceModel(db.Model, metaclass=BaseResource):
                 raise ResourceLinkedError(
                     'Resource still linked by `{}`'.format(name))
 
+    @classmethod
+    def resolve_identifier(cls, id):
+        """Return the (identifier, value) pair to look `id` up with."""
+        identifier = 'id'  # BAN id by default.
+        if isinstance(id, str):
+            identifier, id = parse_identifier(id)
+            if identifier not in cls.identifiers + ['id', 'pk']:
+                raise cls.DoesNotExist("Invalid identifier {}".format(
+                                                        identifier))
+        elif isinstance(id, int):
+            identifier = 'pk'
+        return identifier, id
+
+    @classmethod
+    def lookup_selection(cls, level1=0):
+        if not hasattr(cls, 'auth') and level1 != 1:
+            return (cls._meta.model_class.pk, )
+        return ()
+
     @classmethod
     def coerce(cls, id, identifier=None, level1=0):
 
@@ -166,24 +231,10 @@ class ResourceModel(db.Model, metaclass=BaseResource):
             instance = id
         else:
             if not identifier:
-                identifier = 'id'  # BAN id by default.
-                if isinstance(id, str):
-                    *extra, id = id.split(':')
-                    if extra:
-                        identifier = extra[0]
-                    if identifier not in cls.identifiers + ['id', 'pk']:
-                        raise cls.DoesNotExist("Invalid identifier {}".format(
-                                                                identifier))
-                elif isinstance(id, int):
-                    identifier = 'pk'
+                identifier, id = cls.resolve_identifier(id)
             try:
-
-                if not hasattr(cls, 'auth') and level1 != 1:
-                    instance = cls.raw_select(cls._meta.model_class.pk).where(
-                        getattr(cls, identifier) == id).get()
-                else:
-                    instance = cls.raw_select().where(
-                        getattr(cls, identifier) == id).get()
+                instance = cls.raw_select(*cls.lookup_selection(level1)).where(
+                    getattr(cls, identifier) == id).get()
 
             except cls.DoesNotExist:
                 # Is it an old identifier?
@@ -195,3 +246,46 @@ class ResourceModel(db.Model, metaclass=BaseResource):
                     raise RedirectError(identifier, id, redirects[0])
                 raise
         return instance
+
+    @classmethod
+    def coerce_many(cls, ids, level1=0):
+        """Coerce a list of references with one query per identifier kind.
+
+        References not found this way (redirects, errors) go through
+        `coerce`, one by one."""
+        keys = []
+        lookups = {}
+        for id in ids:
+            key = None
+            if not isinstance(id, db.Model):
+                identifier, value = cls.resolve_identifier(id)
+                # Parsed references are strings (eg. 'pk:123'): give them the
+                # python type of the field, so they match the loaded rows.
+                try:
+                    value = getattr(cls, identifier).coerce(value)
+                except (ValueError, TypeError):
+                    value = None  # Let `coerce` deal with it.
+                key = identifier, value
+                if value is not None:
+                    lookups.setdefault(identifier, []).append(value)
+            keys.append(key)
+        found = {}
+        for identifier, values in lookups.items():
+            field = getattr(cls, identifier)
+            selection = cls.lookup_selection(level1)
+            if selection:
+                selection += (field, )
+            query = cls.raw_select(*selection).where(field << values)
+            for instance in query:
+                value = field.coerce(getattr(instance, identifier))
+                found[identifier, value] = instance
+        instances = []
+        for id, key in zip(ids, keys):
+            if key is None:
+                instance = id
+            else:
+                instance = found.get(key)
+                if instance is None:
+                    instance = cls.coerce(id, None, level1)
+            instances.append(instance)
+        return instances
@@ -85,8 +85,8 @@ class ResourceValidator:
             raise ValueError('Value should not be null')
 
     def validate_choices(self, field, value):
-        choices = [choice[0] for choice in field.choices]
-        if value and value not in choices:
+        if value and value not in field.allowed:
+            choices = [choice[0] for choice in field.choices]
             raise ValueError('`{}` should be one of the following choices: {}'
                              .format(value, ','.join(choices)))
 
@@ -2,10 +2,11 @@ from datetime import datetime
 
 import decorator
 import peewee
+from werkzeug.utils import cached_property
 
 from ban import db
 from ban.auth.models import Client, Session
-from ban.utils import make_diff, utcnow
+from ban.utils import make_diff, parse_identifier, utcnow
 
 from . import context, resource
 from .exceptions import (IsDeletedError, MultipleRedirectsError, RedirectError)
@@ -140,7 +141,9 @@ class Versioned(db.Model, metaclass=BaseVersioned):
             except Exception:
                 pass
             super().save(*args, **kwargs)
-            self.store_version()
+            # Test fixtures may opt out of the history (see factories).
+            if not getattr(self, '_skip_version', False):
+                self.store_version()
             self.lock_version()
 
     def delete_instance(self, *args, **kwargs):
@@ -191,8 +194,9 @@ class Version(db.Model):
         validator = self.model.validator(**self.data)
         return self.model(**validator.data)
 
-    @property
+    @cached_property
     def diff(self):
+        # Stored right after the version, and never updated.
         return Diff.first(Diff.new == self.pk)
 
     @contributor_type_required
@@ -225,9 +229,7 @@ class Version(db.Model):
             if not identifier:
                 identifier = 'sequential'  # BAN id by default.
                 if isinstance(id, str):
-                    *extra, id = id.split(':')
-                    if extra:
-                        identifier = extra[0]
+                    identifier, id = parse_identifier(id, identifier)
                 elif isinstance(id, int):
                     identifier = 'pk'
             try:
@@ -1,27 +1,36 @@
-from playhouse.postgres_ext import PostgresqlExtDatabase
+from playhouse.pool import PooledPostgresqlExtDatabase
 from ban.core import config
 import postgis
 
 
-class DB(PostgresqlExtDatabase):
+class DB(PooledPostgresqlExtDatabase):
 
     prefix = ''
+    # libpq options for every connection, eg. the tests relax durability.
+    options = None
     postgis_registered = False
 
     def __init__(self):
-        super().__init__(None, autorollback=True)
+        # close() gives the connection back to the pool instead of closing
+        # it, so commands and requests do not pay the connection setup.
+        super().__init__(None, autorollback=True, max_connections=32,
+                         stale_timeout=300)
 
     def connect(self):
         # Deal with connection kwargs at connect time only, because we want
         # to be able to instantiate the db object bedore patching the
         # connection kwargs: peewee instanciate it at python parse time, while
         # we want to set connection kwargs after parsing command line.
+        kwargs = {}
+        if self.options:
+            kwargs['options'] = self.options
         self.init(
             self.prefix + config.DB_NAME,
             user=config.get('DB_USER'),
             password=config.get('DB_PASSWORD'),
             host=config.get('DB_HOST'),
-            port=config.get('DB_PORT')
+            port=config.get('DB_PORT'),
+            **kwargs
         )
         super().connect()
 
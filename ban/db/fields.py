@@ -1,6 +1,7 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import json
 import re
+from functools import lru_cache
 
 import peewee
 
@@ -21,6 +22,38 @@ __all__ = ['PointField', 'ForeignKeyField', 'CharField', 'IntegerField',
 lonlat_pattern = re.compile('^[\[\(]{1}(?P<lon>-?\d{,3}(:?\.\d*)?), ?(?P<lat>-?\d{,3}(\.\d*)?)[\]\)]{1}$')  # noqa
 
 
+def parse_coordinate(value):
+    # Same as a lonlat_pattern group, without the regex engine.
+    number = value[1:] if value.startswith('-') else value
+    integer, _, decimals = number.partition('.')
+    if (len(integer) > 3 or not (integer or decimals)
+            or (integer and not integer.isdecimal())
+            or (decimals and not decimals.isdecimal())):
+        return None
+    return float(value)
+
+
+def parse_lonlat(value):
+    """Parse `(lon, lat)` or `[lon, lat]` strings, return None otherwise."""
+    if value[:1] not in ('(', '[') or value[-1:] not in (')', ']'):
+        return None
+    lon, sep, lat = value[1:-1].partition(',')
+    if not sep:
+        return None
+    if lat.startswith(' '):
+        lat = lat[1:]
+    lon, lat = parse_coordinate(lon), parse_coordinate(lat)
+    if lon is None or lat is None:
+        return None
+    return lon, lat
+
+
+@lru_cache(maxsize=None)
+def compile_pattern(pattern):
+    # Already compiled patterns are returned as is by re.compile.
+    return re.compile(pattern)
+
+
 peewee.OP.update(
     BBOX2D='&&',
     BBOXCONTAINS='~',
@@ -57,7 +90,13 @@ class PointField(peewee.Field, postgres_ext.IndexedFieldMixin):
             return value
         if isinstance(value, dict):  # GeoJSON
             value = value['coordinates']
+        if isinstance(value, (list, tuple)):
+            return Point(value[0], value[1], srid=self.srid)
         if isinstance(value, str):
+            lonlat = parse_lonlat(value)
+            if lonlat:
+                return Point(lonlat[0], lonlat[1], srid=self.srid)
+            # Odd input: let the regex sort it out.
             search = lonlat_pattern.search(value)
             if search:
                 value = (float(search.group('lon')),
@@ -110,12 +149,18 @@ class DateRangeField(peewee.Field):
 
 class CachedRelationDescriptor(peewee.RelationDescriptor):
 
+    def __init__(self, field, rel_model):
+        super().__init__(field, rel_model)
+        # Same key as cache.key would build from (model name, id), without
+        # the tuple and join on every access.
+        self.cache_prefix = rel_model.__name__ + '|'
+
     def get_object_or_id(self, instance):
         rel_id = instance._data.get(self.att_name)
         if not rel_id:
             return rel_id
-        keys = (self.rel_model.__name__, rel_id)
-        return cache.cache(keys, super().get_object_or_id, instance)
+        return cache.cache(self.cache_prefix + str(rel_id),
+                           super().get_object_or_id, instance)
 
 
 class ForeignKeyField(peewee.ForeignKeyField):
@@ -139,8 +184,15 @@ class ForeignKeyField(peewee.ForeignKeyField):
 
     def _get_related_name(self):
         # cf https://github.com/coleifer/peewee/pull/844
-        return (self._related_name or '{classname}_set').format(
-                                        classname=self.model_class._meta.name)
+        # Subclasses get deep copies of the inherited fields, cache included:
+        # key it on the model the field belongs to.
+        cached = self.__dict__.get('_computed_related_name')
+        if cached is None or cached[0] is not self.model_class:
+            cached = self._computed_related_name = (
+                self.model_class,
+                (self._related_name or '{classname}_set').format(
+                                        classname=self.model_class._meta.name))
+        return cached[1]
 
 
 class CachedForeignKeyField(ForeignKeyField):
@@ -155,13 +207,19 @@ class CharField(peewee.CharField):
 
     def __init__(self, *args, **kwargs):
         if 'format' in kwargs:
-            self.regex = re.compile(kwargs.pop('format'))
+            self.regex = compile_pattern(kwargs.pop('format'))
         if 'length' in kwargs:
             kwargs['min_length'] = kwargs['max_length'] = kwargs.pop('length')
         self.min_length = kwargs.pop('min_length', None)
         super().__init__(*args, **kwargs)
+        if self.choices is not None:
+            # Membership set for validation, choices keep the display order.
+            self.allowed = frozenset(choice[0] for choice in self.choices)
 
     def coerce(self, value):
+        if type(value) is str:
+            # Most common case, skip peewee's isinstance chain.
+            return value if value or not self.null else None
         if self.null and not value:
             return None
         return super().coerce(value)
@@ -172,6 +230,8 @@ class TextField(peewee.TextField):
     __schema_type__ = 'string'
 
     def coerce(self, value):
+        if type(value) is str:
+            return value if value or not self.null else None
         if self.null and not value:
             return None
         return super().coerce(value)
@@ -182,6 +242,8 @@ class IntegerField(peewee.IntegerField):
     __schema_type__ = 'integer'
 
     def coerce(self, value):
+        if type(value) is int:
+            return value or None
         if not value:
             return None
         return super().coerce(value)
@@ -211,9 +273,11 @@ class ArrayField(postgres_ext.ArrayField):
     __schema_type__ = 'array'
 
     def coerce(self, value):
+        if type(value) is list:
+            return value  # What psycopg2 gives us.
         if not value:
             return []  # Coerce None to [].
-        if value and not isinstance(value, (list, tuple)):
+        if not isinstance(value, (list, tuple)):
             value = [value]
         return value
 
@@ -234,6 +298,9 @@ class DateTimeField(postgres_ext.DateTimeTZField):
     def python_value(self, value):
         value = super().python_value(value)
         if value:
+            if value.utcoffset() == timedelta(0):
+                # Already UTC (psycopg2 gives its own tzinfo): no conversion.
+                return value.replace(tzinfo=timezone.utc)
             # PSQL store dates in the server timezone, but we only want to
             # deal with UTC ones.
             return value.astimezone(timezone.utc)
@@ -252,9 +319,10 @@ class FantoirField(CharField):
         if not value:
             return None
         value = str(value)
-        if len(value) == 10:
+        length = len(value)
+        if length == 10:
             value = value[:9]
-        if not len(value) == 9:
+        elif length != 9:
             raise ValidationError('FANTOIR must be municipality INSEE + 4 '
                                   'first chars of FANTOIR, '
                                   'got `{}` instead'.format(value))
@@ -280,7 +348,11 @@ class ManyToManyField(fields.ManyToManyField):
             return []
         if not isinstance(value, (tuple, list, peewee.SelectQuery)):
             value = [value]
-        value = [self.rel_model.coerce(item, None, level1) for item in value]
+        if hasattr(self.rel_model, 'coerce_many'):
+            value = self.rel_model.coerce_many(list(value), level1)
+        else:
+            value = [self.rel_model.coerce(item, None, level1)
+                     for item in value]
         for elem in value:
             if isinstance(elem, ResourceModel):
                 if deleted is False and elem.deleted_at:
@@ -1,10 +1,50 @@
 import peewee
 
 from .connections import database
+from .fields import ManyToManyField
 from . import cache
 
 
-class SerializerQueryResultWrapper(peewee.ModelQueryResultWrapper):
+def load(instance, name, value):
+    field = instance._meta.fields.get(name)
+    # Foreign keys are already converted by python_value: coercing them again
+    # through __setattr__ would cost one lookup query each. A null primary key
+    # comes from a LEFT OUTER join without match, there is nothing to coerce.
+    # Other values keep going through __setattr__, ie. Field.coerce.
+    if isinstance(field, peewee.ForeignKeyField) or (
+            value is None and field is instance._meta.primary_key):
+        instance._data[name] = value
+    else:
+        setattr(instance, name, value)
+
+
+class NaiveQueryResultWrapper(peewee.NaiveQueryResultWrapper):
+
+    def process_row(self, row):
+        instance = self.model()
+        for i, column, conv in self.conv:
+            load(instance, column, row[i] if conv is None else conv(row[i]))
+        instance._prepare_instance()
+        return instance
+
+
+class ModelQueryResultWrapper(peewee.ModelQueryResultWrapper):
+
+    def construct_instances(self, row, keys=None):
+        collected = {}
+        for i, (key, constructor, attr, conv) in enumerate(self.column_map):
+            if keys is not None and key not in keys:
+                continue
+            if key not in collected:
+                collected[key] = constructor()
+            if attr is None:
+                attr = self.cursor.description[i][0]
+            value = row[i] if conv is None else conv(row[i])
+            load(collected[key], attr, value)
+        return collected
+
+
+class SerializerQueryResultWrapper(ModelQueryResultWrapper):
 
     def process_row(self, row):
         instance = super().process_row(row)
@@ -26,9 +66,35 @@ class SelectQuery(peewee.SelectQuery):
         self._serializer = lambda inst: inst.serialize(mask)
         self._result_wrapper = SerializerQueryResultWrapper
 
+    def project(self, mask):
+        """Only select the columns needed to serialize `mask`.
+
+        Relations and class attributes only need the primary key, but
+        properties may rely on any column, so keep the full selection when
+        the mask asks for one."""
+        model = self.model_class
+        selection = [model._meta.primary_key]
+        for name in mask:
+            field = model._meta.fields.get(name)
+            if isinstance(field, ManyToManyField):
+                continue
+            if field is not None:
+                selection.append(field)
+            elif name == '*' or isinstance(getattr(model, name, None),
+                                           property):
+                return self
+        return self.select(*selection)
+
     def _get_result_wrapper(self):
         wrapper = getattr(self, '_result_wrapper', None)
-        return wrapper or super()._get_result_wrapper()
+        if wrapper:
+            return wrapper
+        wrapper = super()._get_result_wrapper()
+        if wrapper is peewee.ModelQueryResultWrapper:
+            return ModelQueryResultWrapper
+        if wrapper is self.database.get_result_wrapper(peewee.RESULTS_NAIVE):
+            return NaiveQueryResultWrapper
+        return wrapper
 
     def __len__(self):
         return self.count()
@@ -65,6 +131,17 @@ class Model(peewee.Model):
             query = query.order_by(*cls._meta.order_by)
         return query
 
+    @classmethod
+    def insert_batch(cls, rows, size=500):
+        """Insert `rows` (dicts of values) with one INSERT per `size` rows.
+
+        Warning: save() is bypassed, so there is no coercion, nor id
+        generation, nor versioning."""
+        cache.clear()
+        with cls._meta.database.atomic():
+            for start in range(0, len(rows), size):
+                cls.insert_many(rows[start:start + size]).execute()
+
     @classmethod
     def where(cls, *expressions):
         """Shortcut for select().where()"""
@@ -82,5 +159,8 @@ class Model(peewee.Model):
     def __setattr__(self, name, value):
         attr = getattr(self.__class__, name, None)
         if attr and hasattr(attr, 'coerce'):
-            value = attr.coerce(value)
+            # Keep related instances (eg. joined rows) as is, so the relation
+            # descriptor caches them instead of refetching them by pk.
+            if not isinstance(value, getattr(attr, 'rel_model', ())):
+                value = attr.coerce(value)
         return super().__setattr__(name, value)
@@ -183,7 +183,8 @@ class ModelEndpoint(CollectionEndpoint):
             qs = qs.where(qs.model_class.deleted_at.is_null())
             order_by = (self.order_by if self.order_by is not None
                         else [self.model.pk])
-            qs = qs.order_by(*order_by).serialize(self.get_collection_mask())
+            mask = self.get_collection_mask()
+            qs = qs.order_by(*order_by).project(mask).serialize(mask)
         try:
             return self.collection(qs)
         except ValueError as e:
@@ -1051,7 +1052,7 @@ def bbox():
 
 
 @app.route('/openapi', methods=['GET'])
-@app.jsonify
+@app.jsonify(sort=False)
 def openapi():
     return app._schema, 200
 
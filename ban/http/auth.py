@@ -26,7 +26,7 @@ def clientgetter(client_id):
     # FIXME Allow direct token access for dev with email/pwd
     if not is_uuid4(client_id):
         return False
-    return models.Client.first(models.Client.client_id == client_id)
+    return models.Client.from_client_id(client_id)
 
 
 @auth.usergetter
@@ -40,7 +40,11 @@ def usergetter(username):
 @auth.tokengetter
 def tokengetter(access_token=None):
     if access_token:
-        token = models.Token.first(models.Token.access_token == access_token)
+        # Load the session along, it's needed for every authorized request.
+        token = (models.Token.select(models.Token, models.Session)
+                             .join(models.Session)
+                             .where(models.Token.access_token == access_token)
+                             .limit(1).first())
         if token:
             if token.expires > utcnow() and token.expires < utcnow()+ timedelta(minutes=30):
                 token.expires = token.expires + timedelta(hours=1)
@@ -1,7 +1,13 @@
+from copy import deepcopy
+from functools import lru_cache
+
 import yaml
 
 from ban import __version__, db
 
+# Use libyaml bindings when available.
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
 
 BASE = {
     'info': {
@@ -89,25 +95,44 @@ BASE = {
 
 class Schema(dict):
 
+    # Definitions by model, shared between instances.
+    _definitions = {}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.update(BASE)
+        # Paths and definitions are filled per instance: never mutate BASE.
+        self.update(deepcopy(BASE))
 
-    def get_responder_summary(self, responder, resource):
-        return (responder.__doc__ or '').split('\n\n')[0].format(
-            resource=resource.__name__)
+    @staticmethod
+    def get_responder_summary(responder, resource):
+        summary = getattr(responder, '_openapi', None)
+        if summary is None:
+            summary = (responder.__doc__ or '').split('\n\n')
+        return summary[0].format(resource=resource.__name__)
 
-    def get_responder_doc(self, func, resource):
+    @staticmethod
+    def get_responder_doc(func, resource):
+        # One copy per operation: they may be changed once registered.
+        return deepcopy(Schema._parse_responder_doc(func, resource))
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _parse_responder_doc(func, resource):
+        # Endpoints are registered once per verb: only parse the YAML once.
         default = {
-            'summary': self.get_responder_summary(func, resource),
+            'summary': Schema.get_responder_summary(func, resource),
         }
-        try:
-            doc = (func.__doc__ or '').split('\n\n')[1]
-        except IndexError:
+        doc = getattr(func, '_openapi', None)
+        if doc is None:
+            doc = (func.__doc__ or '').split('\n\n')
+        if len(doc) < 2:
             print('Bad openapi docstring for {}'.format(func))
         else:
             try:
-                extra = yaml.load(doc.format(resource=resource.__name__))
+                # Templates are resource dependent, and `{resource}` must be
+                # replaced before parsing (it's a flow mapping for YAML).
+                extra = yaml.load(doc[1].format(resource=resource.__name__),
+                                  Loader=Loader)
             except:
                 print('Bad openapi docstring for {}'.format(func))
             else:
@@ -115,10 +140,13 @@ class Schema(dict):
         return default
 
     def register_model(self, model):
-        if hasattr(model, '__openapi__'):
-            definition = yaml.load(model.__openapi__)
-        else:
-            definition = self.model_definition(model)
+        definition = self._definitions.get(model)
+        if definition is None:
+            if hasattr(model, '__openapi__'):
+                definition = yaml.load(model.__openapi__, Loader=Loader)
+            else:
+                definition = self.model_definition(model)
+            self._definitions[model] = definition
         self['definitions'][model.__name__] = definition
 
     def model_definition(self, model):
@@ -130,14 +158,15 @@ class Schema(dict):
                 continue
             if field.primary_key:
                 continue
-            type_ = getattr(field.__class__, '__schema_type__', None)
+            type_ = getattr(field, '__schema_type__', None)
             if not type_:
                 continue
             row = {
                 'type': [type_]
             }
-            if hasattr(field.__class__, '__schema_format__'):
-                row['format'] = field.__class__.__schema_format__
+            format_ = getattr(field, '__schema_format__', None)
+            if format_:
+                row['format'] = format_
             if isinstance(field, db.ForeignKeyField):
                 row['type'] = ['object', 'string']
                 row['$ref'] = '#/definitions/{}'.format(
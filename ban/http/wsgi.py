@@ -1,4 +1,5 @@
 import re
+import sys
 from datetime import timezone
 from functools import wraps
 
@@ -13,11 +14,20 @@ from ban.db import database
 
 from .schema import Schema
 
+# Flask url params (<converter:name>) to OpenAPI ones ({name}).
+path_param_pattern = re.compile(r'<(\w+:)?(\w+)>')
+
 
 class App(Flask):
     _schema = Schema()
 
-    def jsonify(self, func):
+    def jsonify(self, func=None, *, sort=True):
+        """Dump view return value as JSON.
+
+        sort    sort keys, can be skipped for big static documents"""
+        if func is None:
+            return lambda func: self.jsonify(func, sort=sort)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             rv = func(*args, **kwargs)
@@ -25,7 +35,8 @@ class App(Flask):
                 rv = [rv]
             else:
                 rv = list(rv)
-            rv[0] = dumps(rv[0], sort_keys=True)
+            # Compact output: less to encode and to send for big collections.
+            rv[0] = dumps(rv[0], sort_keys=sort, separators=(',', ':'))
             resp = make_response(tuple(rv))
             resp.mimetype = 'application/json'
             return resp
@@ -37,6 +48,8 @@ class App(Flask):
 
         def wrapper(func):
             func._endpoint = (paths, kwargs)
+            # OpenAPI summary and YAML templates, for the schema.
+            func._openapi = (func.__doc__ or '').split('\n\n')[:2]
             return func
 
         return wrapper
@@ -59,13 +72,13 @@ class App(Flask):
         if kwargs['methods'] != ['GET']:
             scopes = ['{}_write'.format(cls.__name__.lower())]
         func = auth.require_oauth(*scopes)(func)
+        endpoint = sys.intern('{}-{}'.format(cls.__name__, func.__name__)
+                                     .lower().replace('_', '-'))
         for path in paths:
             path = '{}{}'.format(cls.endpoint, path)
-            endpoint = ('{}-{}'.format(cls.__name__, func.__name__)
-                               .lower().replace('_', '-'))
             self.add_url_rule(path, view_func=func, endpoint=endpoint,
                               strict_slashes=False, **kwargs)
-            path = re.sub(r'<(\w+:)?(\w+)>', r'{\2}', path)
+            path = path_param_pattern.sub(r'{\2}', path)
             self._schema.register_endpoint(path, func, kwargs['methods'], cls)
 
 
@@ -113,7 +126,10 @@ def log_headers(resp):
 
 @app.before_request
 def connect_db():
-    database.connect()
+    # Reuse the connection if one is already open in this thread (peewee 2
+    # has no reuse_if_open): connect() would reinit and reset it otherwise.
+    if database.is_closed():
+        database.connect()
 
 
 @app.teardown_request
@@ -1,9 +1,22 @@
+import uuid
+
 import pytest
 
+from ban import db
 from ban.auth import models
+from ban.core import models as core_models
 from ban.tests.factories import UserFactory, ClientFactory
 
 
+def test_session_backrefs_are_named_after_each_versioned_model():
+    # created_by/modified_by are inherited from Versioned by every model.
+    reverse = models.Session._meta.reverse_rel
+    assert reverse['municipality_set'].model_class is core_models.Municipality
+    assert reverse['housenumber_set'].model_class is core_models.HouseNumber
+    assert hasattr(models.Session, 'municipality_set')
+    assert hasattr(models.Session, 'housenumber_set')
+
+
 def test_session_can_be_created_with_a_user():
     user = UserFactory()
     session = models.Session.create(user=user, contributor_type='admin')
@@ -28,6 +41,46 @@ def test_session_can_be_created_with_a_client():
     }
 
 
+def test_session_select_related_loads_user_and_client(sql_spy):
+    client = ClientFactory()
+    session = models.Session.create(client=client, contributor_type='admin')
+    db.cache.clear()
+    sql_spy.reset_mock()
+    loaded = models.Session.select_related().where(
+        models.Session.pk == session.pk).get()
+    assert loaded.serialize() == session.serialize()
+    assert sql_spy.call_count == 1
+
+
 def test_session_should_have_either_a_client_or_a_user():
     with pytest.raises(ValueError):
         models.Session.create()
+
+
+def test_client_from_client_id_is_cached_until_next_save(sql_spy):
+    client = ClientFactory()
+    assert models.Client.from_client_id(str(client.client_id)) == client
+    sql_spy.reset_mock()
+    assert models.Client.from_client_id(str(client.client_id)) == client
+    assert sql_spy.call_count == 0
+    client.save()
+    sql_spy.reset_mock()
+    assert models.Client.from_client_id(str(client.client_id)) == client
+    assert sql_spy.call_count == 1
+
+
+def test_client_from_client_id_cache_expires(sql_spy, monkeypatch):
+    client = ClientFactory()
+    assert models.Client.from_client_id(str(client.client_id)) == client
+    later = models.time.monotonic() + models.Client.CACHE_TTL + 1
+    monkeypatch.setattr(models.time, 'monotonic', lambda: later)
+    sql_spy.reset_mock()
+    assert models.Client.from_client_id(str(client.client_id)) == client
+    assert sql_spy.call_count == 1
+
+
+def test_client_from_client_id_does_not_cache_unknown_ids():
+    client_id = str(uuid.uuid4())
+    assert models.Client.from_client_id(client_id) is None
+    key = ('Client', 'client_id', client_id)
+    assert db.cache.get(key) is db.cache.UNSET
@@ -5,10 +5,12 @@ from unittest.mock import Mock
 from pathlib import Path
 
 from ban.auth import models as amodels
+from ban.commands import command, parser, subparsers
 from ban.commands.auth import (createclient, createuser, dummytoken,
                                listclients, listusers, invalidatetoken)
 from ban.commands.db import truncate
 from ban.commands.export import resources
+from ban.commands.reporter import ERROR, NOTICE, Reporter
 from ban.core import models
 from ban.core.encoder import dumps
 from ban.tests import factories
@@ -39,6 +41,18 @@ def test_listusers(capsys):
     out, err = capsys.readouterr()
     assert user.username in out
     assert user.id in out
+    assert user.email in out
+
+
+def test_listusers_prints_one_line_per_user(capsys):
+    user = factories.UserFactory()
+    listusers()
+    out, err = capsys.readouterr()
+    # Followed by the (empty) report.
+    assert out.splitlines()[:2] == [
+        '{:<20} {} {}'.format('id', 'username', 'email'),
+        '{:<20} {} {}'.format(user.id, user.username, user.email),
+    ]
 
 
 def test_listusers_with_invoke(capsys):
@@ -48,6 +62,48 @@ def test_listusers_with_invoke(capsys):
     assert user.username in out
 
 
+@pytest.fixture
+def unregister():
+    """Remove the commands registered by a test from the global parser."""
+    names = []
+    yield names.append
+    for name in names:
+        subparsers._name_parser_map.pop(name, None)
+        subparsers._choices_actions[:] = [
+            action for action in subparsers._choices_actions
+            if action.dest != name]
+
+
+def test_command_parser_is_only_built_when_invoked(unregister):
+
+    @command
+    def lazy(**kwargs):
+        """Lazy command."""
+
+    unregister(lazy.name)
+    assert lazy._parser is None
+    args = parser.parse_args([lazy.name])
+    assert lazy._parser is not None
+    assert args.func == lazy.invoke
+
+
+def test_command_parameters_help_is_read_from_docstring(monkeypatch):
+    # No need for the global parser: keep the command local to this test.
+    monkeypatch.setattr(subparsers, 'add_command', lambda command: None)
+
+    @command
+    def documented(path, resource, limit=10, **kwargs):
+        """Documented command.
+
+        path    path of the file
+        resource Municipality or Group
+        """
+
+    assert documented.parse_parameter_help('path') == 'path of the file'
+    assert documented.parse_parameter_help('resource') == 'Municipality or Group'  # noqa
+    assert documented.parse_parameter_help('limit') == ''
+
+
 def test_create_client_should_accept_username():
     user = factories.UserFactory()
     assert not amodels.Client.select().count()
@@ -118,6 +174,20 @@ def test_listclients(capsys):
     assert ''.join(client.contributor_types) in out
 
 
+def test_listclients_prints_one_line_per_client(capsys):
+    client = factories.ClientFactory()
+    listclients()
+    out, err = capsys.readouterr()
+    line = '{:<50} {:<40} {:<40} {:<60} {:<200} {}'.format
+    assert out.splitlines()[:2] == [
+        line('id', 'name', 'client_id', 'client_secret', 'scopes',
+             'contributor_types'),
+        line(client.id, client.name, str(client.client_id),
+             client.client_secret, ' '.join(client.scopes),
+             ' '.join(client.contributor_types)),
+    ]
+
+
 def test_truncate_should_truncate_all_tables_by_default(monkeypatch):
     factories.MunicipalityFactory()
     factories.GroupFactory()
@@ -272,3 +342,13 @@ def test_invalidate_token_with_client(capsys):
     assert utcnow().date() >= updated_token.expires.date()
     assert updated_token.is_expired
     assert updated_valid_token.is_valid()
+
+
+def test_reporter_only_counts_reports_above_verbosity():
+    reporter = Reporter(1)
+    reporter('Errored', 'foo', ERROR)
+    reporter('Created', 'bar', NOTICE)
+    reporter('Created', 'baz', NOTICE)
+    assert reporter._reports[ERROR] == {'Errored': ['foo']}
+    assert reporter._reports[NOTICE] == {'Created': 2}
+    assert 'Created (2)' in str(reporter)
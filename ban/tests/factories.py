@@ -9,6 +9,9 @@ from ban.auth import models as auth_models
 from ban.core import models, versioning
 from ban.utils import utcnow
 
+# Seeded once: a fresh Random() reads os.urandom at each call.
+_random = Random()
+
 
 class BaseTestModel(PeeweeModelFactory):
 
@@ -82,11 +85,21 @@ class BaseFactory(BaseTestModel):
     created_by = factory.SubFactory(SessionFactory)
     modified_by = factory.SubFactory(SessionFactory)
 
+    @classmethod
+    def _create(cls, model_class, *args, versioned=True, **kwargs):
+        # versioned=False saves one Version INSERT for tests not reading it.
+        if versioned:
+            return super()._create(model_class, *args, **kwargs)
+        instance = model_class(**kwargs)
+        instance._skip_version = True
+        instance.save(force_insert=True)
+        return instance
+
 
 class MunicipalityFactory(BaseFactory):
     name = "Montbrun-Bocage"
-    insee = FuzzyAttribute(lambda: str(Random().randint(10000, 97000)))
-    siren = FuzzyAttribute(lambda: str(Random().randint(100000000, 300000000)))
+    insee = FuzzyAttribute(lambda: str(_random.randint(10000, 97000)))
+    siren = FuzzyAttribute(lambda: str(_random.randint(100000000, 300000000)))
 
     class Meta:
         model = models.Municipality
@@ -136,6 +149,34 @@ class PositionFactory(BaseFactory):
         model = models.Position
 
 
+def bulk(factory_class, count, **kwargs):
+    """Create `count` resources of a BaseFactory in a single INSERT.
+
+    Fast, but save() is bypassed: no Version nor Diff is stored, so only use
+    it for fixtures not involved in versioning.
+    Relations are built, not created: pass saved instances for the required
+    ones (eg. `municipality=MunicipalityFactory()`)."""
+    model = factory_class._meta.model
+    session = SessionFactory()
+    now = utcnow()
+    rows = []
+    for instance in factory_class.build_batch(count, created_by=session,
+                                              modified_by=session, **kwargs):
+        for name, related in instance._obj_cache.items():
+            if related is not None and related.pk is None:
+                raise ValueError('bulk() does not save relations: pass a '
+                                 'saved instance for `{}`'.format(name))
+        instance.id = model.make_id()
+        instance.version = 1
+        instance.created_at = instance.modified_at = now
+        rows.append({model._meta.fields[name]: value
+                     for name, value in instance._data.items()
+                     if name != 'pk'})
+    model.insert_batch(rows)
+    ids = [row[model.id] for row in rows]
+    return list(model.select().where(model.id << ids).order_by(model.pk))
+
+
 class VersionFactory(BaseTestModel):
     model_name = 'resource'
     model_pk = FuzzyInteger(1, 97000)
@@ -6,7 +6,8 @@ from ban.core.encoder import dumps
 from ban.core.versioning import Version, Redirect
 from ban.utils import utcnow
 
-from ban.tests.factories import MunicipalityFactory, PostCodeFactory, GroupFactory
+from ban.tests.factories import (MunicipalityFactory, PostCodeFactory,
+                                GroupFactory, bulk)
 from ban.tests.http.utils import authorize
 
 
@@ -40,7 +41,7 @@ def test_get_municipality_groups_collection(get):
 @authorize
 def test_get_municipality_groups_collection_is_paginated(get):
     municipality = MunicipalityFactory(name="Cabour")
-    GroupFactory.create_batch(6, municipality=municipality)
+    bulk(GroupFactory, 6, municipality=municipality)
     resp = get('/group?municipality={}&limit=4'.format(municipality.id))
     page1 = resp.json
     assert len(page1['collection']) == 4
@@ -62,7 +63,7 @@ def test_get_municipality_groups_collection_is_paginated(get):
 @authorize
 def test_get_municipality_collection_is_ceiled(get, monkeypatch):
     monkeypatch.setattr('ban.http.api.CollectionEndpoint.MAX_LIMIT', 4)
-    MunicipalityFactory.create_batch(6)
+    bulk(MunicipalityFactory, 6)
     resp = get('/municipality?limit=6')
     page1 = resp.json
     assert len(page1['collection']) == 4
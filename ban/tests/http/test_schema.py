@@ -5,6 +5,8 @@ from flask import request
 from flex.core import load, validate, validate_api_call
 from flex.http import Request, Response
 
+from ban.http.schema import BASE, Schema
+
 from .. import factories
 from .utils import authorize
 
@@ -112,3 +114,36 @@ def test_get_position_collection(get, schema):
     factories.PositionFactory()
     resp = get('/position/')
     validate_call(resp, schema)
+
+
+def test_schema_instances_do_not_share_paths():
+    schema = Schema()
+    schema['paths']['/foo'] = {}
+    assert '/foo' not in Schema()['paths']
+    assert '/foo' not in BASE['paths']
+
+
+def test_registered_operations_do_not_share_their_doc():
+
+    class Resource:
+        pass
+
+    def responder():
+        """Get {resource}.
+
+        responses:
+            200:
+                description: OK."""
+
+    schema = Schema()
+    schema.register_endpoint('/foo', responder, ['GET', 'HEAD'], Resource)
+    schema['paths']['/foo']['get']['parameters'] = []
+    schema['paths']['/foo']['get']['responses'][200]['foo'] = 'bar'
+    assert 'parameters' not in schema['paths']['/foo']['head']
+    assert 'foo' not in schema['paths']['/foo']['head']['responses'][200]
+    other = Schema()
+    other.register_endpoint('/foo', responder, ['GET'], Resource)
+    assert other['paths']['/foo']['get'] == {
+        'summary': 'Get Resource.',
+        'responses': {200: {'description': 'OK.'}},
+    }
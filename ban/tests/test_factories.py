@@ -1,3 +1,5 @@
+import pytest
+
 from . import factories
 
 
@@ -42,3 +44,15 @@ def test_housenumber_can_be_instanciated():
 def test_position_can_be_instanciated():
     position = factories.PositionFactory()
     assert position.center
+
+
+def test_bulk_refuses_unsaved_relations():
+    with pytest.raises(ValueError):
+        factories.bulk(factories.GroupFactory, 2)
+
+
+def test_bulk_accepts_saved_relations():
+    municipality = factories.MunicipalityFactory()
+    groups = factories.bulk(factories.GroupFactory, 2,
+                            municipality=municipality)
+    assert [group.municipality for group in groups] == [municipality] * 2
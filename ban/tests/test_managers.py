@@ -1,6 +1,7 @@
+from ban import db
 from ban.core import models
 
-from .factories import GroupFactory, MunicipalityFactory
+from .factories import GroupFactory, MunicipalityFactory, bulk
 
 
 def test_municipality_serialize():
@@ -13,7 +14,38 @@ def test_group_as_resource():
     assert list(models.Group.select().serialize()) == [street.serialize()]
 
 
+def test_group_collection_serialization_does_not_query_per_row(sql_spy):
+    municipality = MunicipalityFactory()
+    bulk(GroupFactory, 3, municipality=municipality)
+    mask = dict.fromkeys(models.Group.collection_fields, {})
+    db.cache.clear()
+    sql_spy.reset_mock()
+    # Not list(), which would ask for len(), ie. a COUNT query.
+    rows = [row for row in models.Group.select().serialize(mask)]
+    assert len(rows) == 3
+    assert all(row['municipality'] == municipality.id for row in rows)
+    # The groups, then their municipality once: the other rows get it from
+    # the cache.
+    assert sql_spy.call_count == 2
+
+
 def test_municipality_streets_as_resource():
     municipality = MunicipalityFactory()
     street = GroupFactory(municipality=municipality)
     assert list(municipality.groups.serialize()) == [street.serialize()]
+
+
+def test_project_only_selects_mask_columns():
+    municipality = MunicipalityFactory(name='Epine')
+    mask = {'id': {}, 'name': {}, 'resource': {}}
+    qs = models.Municipality.select().project(mask)
+    assert list(qs.serialize(mask)) == [municipality.serialize(mask)]
+    loaded = qs.first()
+    assert loaded.name == 'Epine'
+    assert loaded.created_at is None
+
+
+def test_project_keeps_full_selection_for_properties():
+    MunicipalityFactory()
+    qs = models.Municipality.select().project({'id': {}, 'status': {}})
+    assert qs.first().created_at is not None
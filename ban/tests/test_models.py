@@ -3,6 +3,8 @@ import datetime
 import peewee
 import pytest
 
+from ban import db
+from ban.auth.models import User
 from ban.core import models
 
 from .factories import (GroupFactory, HouseNumberFactory, MunicipalityFactory,
@@ -35,17 +37,16 @@ def test_municipality_is_created_with_version_1():
 def test_municipality_as_resource():
     municipality = MunicipalityFactory(name="Montbrun-Bocage", insee="31365",
                                        siren="210100566")
-    postcode = PostCodeFactory(code="31310", municipality=municipality)
-
-    assert municipality.as_resource['name'] == "Montbrun-Bocage"
-    assert municipality.as_resource['insee'] == "31365"
-    assert municipality.as_resource['siren'] == "210100566"
-    assert municipality.as_resource['version'] == 1
-    assert municipality.as_resource['id'] == municipality.id
+    resource = municipality.as_resource
+    assert resource['name'] == "Montbrun-Bocage"
+    assert resource['insee'] == "31365"
+    assert resource['siren'] == "210100566"
+    assert resource['version'] == 1
+    assert resource['id'] == municipality.id
 
 
 def test_municipality_str():
-    municipality = MunicipalityFactory(name="Salsein")
+    municipality = MunicipalityFactory(name="Salsein", versioned=False)
     assert str(municipality) == 'Salsein'
 
 
@@ -62,7 +63,7 @@ def test_unique_fields(factory, kwargs):
 def test_should_allow_deleting_municipality_not_linked():
     municipality = MunicipalityFactory()
     municipality.delete_instance()
-    assert not models.Municipality.select().count()
+    assert not models.Municipality.select().exists()
 
 
 def test_should_not_allow_deleting_municipality_linked_to_street():
@@ -76,7 +77,7 @@ def test_should_not_allow_deleting_municipality_linked_to_street():
 def test_should_allow_deleting_street_not_linked():
     street = GroupFactory()
     street.delete_instance()
-    assert not models.Group.select().count()
+    assert not models.Group.select().exists()
 
 
 def test_should_not_allow_deleting_street_linked_to_housenumber():
@@ -87,26 +88,16 @@ def test_should_not_allow_deleting_street_linked_to_housenumber():
     assert models.Group.get(models.Group.id == street.id)
 
 
-def test_compute_cia_should_consider_insee_fantoir_number_and_ordinal():
-    municipality = MunicipalityFactory(insee='93031')
-    street = GroupFactory(municipality=municipality, fantoir='930311491')
-    hn = HouseNumberFactory(parent=street, number="84", ordinal="bis")
-    hn = models.HouseNumber.get(models.HouseNumber.id == hn.id)
-    assert hn.compute_cia() == '93031_1491_84_BIS'
-
-
-def test_compute_cia_should_let_ordinal_empty_if_not_set():
-    municipality = MunicipalityFactory(insee='93031')
-    street = GroupFactory(municipality=municipality, fantoir='930311491')
-    hn = HouseNumberFactory(parent=street, number="84", ordinal="")
-    assert hn.compute_cia() == '93031_1491_84_'
-
-
-def test_compute_cia_should_use_locality_if_no_street():
-    municipality = MunicipalityFactory(insee='93031')
-    street = GroupFactory(municipality=municipality, fantoir='930311491')
-    hn = HouseNumberFactory(parent=street, number="84", ordinal="")
-    assert hn.compute_cia() == '93031_1491_84_'
+@pytest.mark.parametrize('ordinal,expected', [
+    ('bis', '93031_1491_84_BIS'),
+    ('', '93031_1491_84_'),
+])
+def test_compute_cia_should_consider_insee_fantoir_number_and_ordinal(
+        ordinal, expected):
+    street = GroupFactory(municipality__insee='93031', fantoir='930311491')
+    # No need to save the housenumber to compute its cia.
+    hn = HouseNumberFactory.build(parent=street, number="84", ordinal=ordinal)
+    assert hn.compute_cia() == expected
 
 
 def test_can_create_group_with_fantoir_equal_to_9_chars(get):
@@ -177,10 +168,12 @@ def test_get_group_housenumbers_parent_ancestor_sorted():
 
 
 def test_cannot_duplicate_housenumber_on_same_street():
-    street = GroupFactory()
-    HouseNumberFactory(parent=street, ordinal="b", number="10")
+    street = GroupFactory(versioned=False)
+    HouseNumberFactory(parent=street, ordinal="b", number="10",
+                       versioned=False)
     with pytest.raises(peewee.IntegrityError):
-        HouseNumberFactory(parent=street, ordinal="b", number="10")
+        HouseNumberFactory(parent=street, ordinal="b", number="10",
+                           versioned=False)
 
 
 def test_cannot_create_housenumber_without_parent():
@@ -189,15 +182,17 @@ def test_cannot_create_housenumber_without_parent():
 
 
 def test_housenumber_str():
-    hn = HouseNumberFactory(ordinal="b", number="10")
+    hn = HouseNumberFactory(ordinal="b", number="10", versioned=False)
     assert str(hn) == '10 b'
 
 
 def test_can_create_two_housenumbers_with_same_number_but_different_streets():
-    street = GroupFactory()
-    street2 = GroupFactory()
-    HouseNumberFactory(parent=street, ordinal="b", number="10")
-    HouseNumberFactory(parent=street2, ordinal="b", number="10")
+    street = GroupFactory(versioned=False)
+    street2 = GroupFactory(versioned=False)
+    HouseNumberFactory(parent=street, ordinal="b", number="10",
+                       versioned=False)
+    HouseNumberFactory(parent=street2, ordinal="b", number="10",
+                       versioned=False)
 
 
 def test_housenumber_positions():
@@ -237,10 +232,10 @@ def test_remove_housenumber_ancestors():
 def test_should_allow_deleting_housenumber_not_linked():
     housenumber = HouseNumberFactory()
     housenumber.delete_instance()
-    assert not models.HouseNumber.select().count()
+    assert not models.HouseNumber.select().exists()
 
 
-def test_should_not_allow_deleting_housenumber_not_linked():
+def test_should_not_allow_deleting_housenumber_linked_to_position():
     housenumber = HouseNumberFactory()
     PositionFactory(housenumber=housenumber)
     with pytest.raises(peewee.IntegrityError):
@@ -281,9 +276,47 @@ def test_housenumber_municipality_is_cached(mocker, sql_spy):
     expected = housenumber.parent.municipality
     sql_spy.reset_mock()
     assert housenumber.municipality == expected
+    assert sql_spy.call_count == 0
+
+
+def test_housenumber_select_related_loads_parent_and_municipality(sql_spy):
+    HouseNumberFactory()
+    db.cache.clear()
+    sql_spy.reset_mock()
+    housenumber = models.HouseNumber.select_related().first()
+    assert housenumber.municipality.insee
     assert sql_spy.call_count == 1
-    assert housenumber.municipality == expected
+
+
+def test_loading_rows_does_not_look_foreign_keys_up(sql_spy):
+    housenumber = HouseNumberFactory()
+    db.cache.clear()
+    sql_spy.reset_mock()
+    loaded = models.HouseNumber.select().first()
     assert sql_spy.call_count == 1
+    assert loaded._data['parent'] == housenumber.parent.pk
+
+
+def test_loaded_values_are_coerced():
+    group = GroupFactory()
+    municipality = group.municipality
+    # Raw SQL, as writes would coerce the values too.
+    sql = 'UPDATE "{}" SET {} = %s'.format
+    db.database.execute_sql(sql(models.Group._meta.db_table, 'ign'), [''])
+    db.database.execute_sql(sql(models.Municipality._meta.db_table, 'alias'),
+                            [None])
+    assert models.Group.get(models.Group.pk == group.pk).ign is None
+    loaded = models.Municipality.get(models.Municipality.pk == municipality.pk)
+    assert loaded.alias == []
+
+
+def test_insert_batch(sql_spy):
+    rows = [{'id': User.make_id(), 'username': 'user{}'.format(i),
+             'email': 'user{}@example.org'.format(i)} for i in range(5)]
+    User.insert_batch(rows, size=2)
+    assert User.select().count() == 5
+    inserts = [c for c in sql_spy.call_args_list if 'INSERT' in str(c)]
+    assert len(inserts) == 3
 
 
 def test_position_children():
@@ -313,18 +346,24 @@ def test_get_instantiate_object_properly():
     ((1.123456789, 2.987654321), (1.123456789, 2.987654321)),
     ([1, 2], (1, 2)),
     ("(1, 2)", (1, 2)),
+    ("[-1.5,48.25]", (-1.5, 48.25)),
     (None, None),
     ("", None),
 ])
 def test_position_center_coerce(given, expected):
-    position = PositionFactory(center=given, name="bâtiment Z")
-    center = models.Position.get(models.Position.id == position.id).center
+    center = models.Position.center.coerce(given)
     if given:
         assert center.coords == expected
     else:
         assert not center
 
 
+def test_position_center_is_stored():
+    position = PositionFactory(center="(1.123456789, 2.987654321)")
+    center = models.Position.get(models.Position.id == position.id).center
+    assert center.coords == (1.123456789, 2.987654321)
+
+
 def test_position_municipality_is_cached(mocker, sql_spy):
     PositionFactory()
     # Load the model from scratch, otherwise Diff creation has already
@@ -333,6 +372,4 @@ def test_position_municipality_is_cached(mocker, sql_spy):
     expected = pos.housenumber.parent.municipality
     sql_spy.reset_mock()
     assert pos.municipality == expected
-    assert sql_spy.call_count == 1
-    assert pos.municipality == expected
-    assert sql_spy.call_count == 1
+    assert sql_spy.call_count == 0
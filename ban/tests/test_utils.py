@@ -1,4 +1,4 @@
-from ban.utils import parse_mask
+from ban.utils import parse_identifier, parse_mask
 
 
 def test_parse_mask():
@@ -18,3 +18,9 @@ def test_parse_mask():
             }
         }
     }
+
+
+def test_parse_identifier():
+    assert parse_identifier('insee:33001') == ('insee', '33001')
+    assert parse_identifier('ban-municipality-1234') == ('id', 'ban-municipality-1234')  # noqa
+    assert parse_identifier('123', 'sequential') == ('sequential', '123')
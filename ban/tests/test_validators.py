@@ -468,6 +468,27 @@ def test_can_create_housenumber_with_ancestor_ids(session):
     assert district in housenumber.ancestors
 
 
+def test_ancestor_ids_are_resolved_in_one_query(session, sql_spy):
+    district = GroupFactory(name="IIIe arrondissement", kind=models.Group.AREA)
+    other = GroupFactory(name="Quartier Latin", kind=models.Group.AREA)
+    field = models.HouseNumber.ancestors
+    sql_spy.reset_mock()
+    ancestors = field.coerce([other.id, district.id])
+    assert sql_spy.call_count == 1
+    assert [a.pk for a in ancestors] == [other.pk, district.pk]
+
+
+def test_ancestor_pk_references_are_resolved_in_one_query(session, sql_spy):
+    district = GroupFactory(name="IIIe arrondissement", kind=models.Group.AREA)
+    other = GroupFactory(name="Quartier Latin", kind=models.Group.AREA)
+    field = models.HouseNumber.ancestors
+    sql_spy.reset_mock()
+    ancestors = field.coerce(['pk:{}'.format(other.pk),
+                              'pk:{}'.format(district.pk)])
+    assert sql_spy.call_count == 1
+    assert [a.pk for a in ancestors] == [other.pk, district.pk]
+
+
 def test_can_update_housenumber_ancestor(session):
     district = GroupFactory(name="IIIe arrondissement", kind=models.Group.AREA)
     housenumber = HouseNumberFactory()
@@ -1,6 +1,7 @@
 import peewee
 import pytest
 
+from ban import db
 from ban.core import models
 from ban.core.versioning import Version
 
@@ -30,29 +31,31 @@ def test_municipality_version():
 
 
 def test_municipality_is_versioned():
-    municipality = MunicipalityFactory(name='Moret-sur-Loing')
-    assert len(municipality.versions) == 1
-    assert municipality.version == 1
-    municipality.name = 'Orvanne'
-    municipality.increment_version()
-    municipality.save()
-    assert municipality.version == 2
-    versions = municipality.versions
-    assert len(versions) == 2
-    version1 = versions[0].load()
-    version2 = versions[1].load()
-    assert versions[0].period.upper == versions[1].period.lower
-    assert versions[1].period.upper is None
-    assert version1.name == 'Moret-sur-Loing'
-    assert version2.name == 'Orvanne'
-    municipality.insee = '77316'
-    municipality.increment_version()
-    municipality.save()
-    versions = municipality.versions
-    assert len(versions) == 3
-    assert versions[0].period.upper == versions[1].period.lower
-    assert versions[1].period.upper == versions[2].period.lower
-    assert versions[2].period.upper is None
+    # One transaction for the whole scenario.
+    with db.database.atomic():
+        municipality = MunicipalityFactory(name='Moret-sur-Loing')
+        assert len(municipality.versions) == 1
+        assert municipality.version == 1
+        municipality.name = 'Orvanne'
+        municipality.increment_version()
+        municipality.save()
+        assert municipality.version == 2
+        versions = list(municipality.versions)
+        assert len(versions) == 2
+        version1 = versions[0].load()
+        version2 = versions[1].load()
+        assert versions[0].period.upper == versions[1].period.lower
+        assert versions[1].period.upper is None
+        assert version1.name == 'Moret-sur-Loing'
+        assert version2.name == 'Orvanne'
+        municipality.insee = '77316'
+        municipality.increment_version()
+        municipality.save()
+        versions = list(municipality.versions)
+        assert len(versions) == 3
+        assert versions[0].period.upper == versions[1].period.lower
+        assert versions[1].period.upper == versions[2].period.lower
+        assert versions[2].period.upper is None
 
 
 def test_save_should_be_rollbacked_if_version_save_fails():
@@ -69,22 +72,24 @@ def test_save_should_be_rollbacked_if_version_save_fails():
 
 
 def test_group_is_versioned():
-    initial_name = "Rue des Pommes"
-    street = GroupFactory(name=initial_name)
-    assert street.version == 1
-    street.name = "Rue des Poires"
-    street.increment_version()
-    street.save()
-    assert street.version == 2
-    assert len(street.versions) == 2
-    version1 = street.versions[0].load()
-    version2 = street.versions[1].load()
-    assert version1.name == "Rue des Pommes"
-    assert version2.name == "Rue des Poires"
-    assert street.versions[0].diff
-    diff = street.versions[1].diff
-    assert len(diff.diff) == 1  # name, version
-    assert diff.diff['name']['new'] == "Rue des Poires"
+    with db.database.atomic():
+        initial_name = "Rue des Pommes"
+        street = GroupFactory(name=initial_name)
+        assert street.version == 1
+        street.name = "Rue des Poires"
+        street.increment_version()
+        street.save()
+        assert street.version == 2
+        versions = list(street.versions)
+        assert len(versions) == 2
+        version1 = versions[0].load()
+        version2 = versions[1].load()
+        assert version1.name == "Rue des Pommes"
+        assert version2.name == "Rue des Poires"
+        assert versions[0].diff
+        diff = versions[1].diff
+        assert len(diff.diff) == 1  # name, version
+        assert diff.diff['name']['new'] == "Rue des Poires"
 
 
 def test_group_version():
@@ -113,19 +118,21 @@ def test_group_version():
 
 
 def test_housenumber_is_versioned():
-    street = GroupFactory()
-    hn = HouseNumberFactory(parent=street, ordinal="b")
-    assert hn.version == 1
-    hn.ordinal = "bis"
-    hn.increment_version()
-    hn.save()
-    assert hn.version == 2
-    assert len(hn.versions) == 2
-    version1 = hn.versions[0].load()
-    version2 = hn.versions[1].load()
-    assert version1.ordinal == "b"
-    assert version2.ordinal == "bis"
-    assert version2.parent == street
+    with db.database.atomic():
+        street = GroupFactory()
+        hn = HouseNumberFactory(parent=street, ordinal="b")
+        assert hn.version == 1
+        hn.ordinal = "bis"
+        hn.increment_version()
+        hn.save()
+        assert hn.version == 2
+        versions = list(hn.versions)
+        assert len(versions) == 2
+        version1 = versions[0].load()
+        version2 = versions[1].load()
+        assert version1.ordinal == "b"
+        assert version2.ordinal == "bis"
+        assert version2.parent == street
 
 
 def test_housenumber_as_version():
@@ -157,19 +164,23 @@ def test_housenumber_as_version():
 
 
 def test_position_is_versioned():
-    housenumber = HouseNumberFactory()
-    position = PositionFactory(housenumber=housenumber, center=(1, 2))
-    assert position.version == 1
-    position.center = (3, 4)
-    position.increment_version()
-    position.save()
-    assert position.version == 2
-    assert len(position.versions) == 2
-    version1 = position.versions[0].load()
-    version2 = position.versions[1].load()
-    assert version1.center.geojson == {'type': 'Point', 'coordinates': (1, 2)}
-    assert version2.center.geojson == {'type': 'Point', 'coordinates': (3, 4)}
-    assert version2.housenumber == housenumber
+    with db.database.atomic():
+        housenumber = HouseNumberFactory()
+        position = PositionFactory(housenumber=housenumber, center=(1, 2))
+        assert position.version == 1
+        position.center = (3, 4)
+        position.increment_version()
+        position.save()
+        assert position.version == 2
+        versions = list(position.versions)
+        assert len(versions) == 2
+        version1 = versions[0].load()
+        version2 = versions[1].load()
+        assert version1.center.geojson == {'type': 'Point',
+                                            'coordinates': (1, 2)}
+        assert version2.center.geojson == {'type': 'Point',
+                                            'coordinates': (3, 4)}
+        assert version2.housenumber == housenumber
 
 
 def test_position_as_version():
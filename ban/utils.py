@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from functools import wraps
+from functools import lru_cache, wraps
 from uuid import UUID
 
 
@@ -58,3 +58,12 @@ def parse_mask(source):
                 parent[field] = {}
             parent = parent[field]
     return dest
+
+
+@lru_cache(maxsize=4096)
+def parse_identifier(value, default='id'):
+    """Split an `identifier:value` string, eg. `insee:33001`.
+
+    default     identifier to use when none is given"""
+    *extra, value = value.split(':')
+    return (extra[0] if extra else default), value
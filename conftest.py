@@ -1,21 +1,66 @@
 import json
+import os
 
+import psycopg2
 import pytest
 from flask import url_for
 from flask.testing import FlaskClient
 
 from ban import db
 from ban.commands.db import create as createdb
-from ban.commands.db import truncate as truncatedb
 from ban.commands.db import models
 from ban.commands.reporter import Reporter
+from ban.core import config as ban_config
 from ban.core import context
 from ban.http.api import app as application
 from ban.tests.factories import SessionFactory, TokenFactory, UserFactory
 
+# Same as the truncate command, but in one round trip: delete in reverse way
+# not to break FK constraints.
+CLEAN_TABLES = ';'.join('DELETE FROM "{}"'.format(model._meta.db_table)
+                        for model in models[::-1])
+
+
+def is_xdist_controller(config):
+    # With pytest-xdist, only the workers run tests: the controller process
+    # must not hold a connection to the template test database.
+    return (not hasattr(config, 'workerinput')
+            and bool(getattr(config.option, 'numprocesses', None)))
+
+
+def create_worker_database(worker):
+    """Clone the test database for a pytest-xdist worker, if needed."""
+    template = 'test_' + ban_config.DB_NAME
+    name = 'test_{}_{}'.format(worker, ban_config.DB_NAME)
+    conn = psycopg2.connect(dbname='postgres',
+                            user=ban_config.get('DB_USER'),
+                            password=ban_config.get('DB_PASSWORD'),
+                            host=ban_config.get('DB_HOST'),
+                            port=ban_config.get('DB_PORT'))
+    conn.autocommit = True  # CREATE DATABASE can't run in a transaction.
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1 FROM pg_database WHERE datname = %s',
+                           (name, ))
+            if not cursor.fetchone():
+                # Extensions (postgis, hstore) come with the template.
+                cursor.execute('CREATE DATABASE "{}" TEMPLATE "{}"'.format(
+                    name, template))
+    finally:
+        conn.close()
+
 
 def pytest_configure(config):
+    if is_xdist_controller(config):
+        return
     db.database.prefix = 'test_'
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker:
+        # One database per worker, so they don't clean each other's tables.
+        create_worker_database(worker)
+        db.database.prefix = 'test_{}_'.format(worker)
+    # Throwaway data: don't wait for the WAL flush at each commit.
+    db.database.options = '-c synchronous_commit=off'
     db.database.connect()
     createdb(fail_silently=True)
     verbose = config.getoption('verbose')
@@ -25,6 +70,8 @@ def pytest_configure(config):
 
 
 def pytest_unconfigure(config):
+    if is_xdist_controller(config):
+        return
     db.database.drop_tables(models)
     db.database.close()
     db.cache.clear()
@@ -32,7 +79,9 @@ def pytest_unconfigure(config):
 
 def pytest_runtest_setup(item):
     assert db.database.database.startswith('test_')
-    truncatedb(force=True)
+    db.database.execute_sql(CLEAN_TABLES)
+    # Like any command run would do.
+    context.set('reporter', Reporter(ban_config.get('VERBOSE')))
     context.set('session', None)
 
 
@@ -138,7 +187,6 @@ class MonkeyPatchWrapper(object):
 
 @pytest.fixture()
 def config(request, monkeypatch):
-    from ban.core import config as ban_config
     # Make sure config cache is empty.
     ban_config.clear()
     return MonkeyPatchWrapper(monkeypatch, ban_config)